@@ -0,0 +1,61 @@
+"""
+_core.py
+Numba-compiled kernels for the bond pricing engine.
+Kept in a separate module so the JIT cache lives alongside a small, stable file.
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, fastmath=True)
+def _price_core(face_value, coupon_rate, ytm, n_periods):
+    """
+    Single-pass DCF over n_periods semi-annual cash flows.
+
+    Returns:
+        (price, mac_sum, conv_sum) where
+            price    = Σ PV_k
+            mac_sum  = Σ PV_k · k
+            conv_sum = Σ PV_k · k · (k + 1)
+    """
+    semi_coupon = face_value * coupon_rate * 0.5
+    growth      = 1.0 + ytm * 0.5
+    df          = 1.0
+    price = mac_sum = conv_sum = 0.0
+
+    for k in range(1, n_periods + 1):
+        df *= growth
+        cf  = semi_coupon + (face_value if k == n_periods else 0.0)
+        pv  = cf / df
+        price    += pv
+        mac_sum  += pv * k
+        conv_sum += pv * k * (k + 1)
+
+    return price, mac_sum, conv_sum
+
+
+@njit(cache=True, fastmath=True)
+def _price_core_vec(face_value, coupon_rate, ytms, n_periods):
+    """
+    Prices of one bond at each yield in ytms, via the same running
+    discount-factor product as _price_core (no pow, no temporaries).
+    """
+    semi_coupon = face_value * coupon_rate * 0.5
+    prices      = np.empty(ytms.shape[0])
+
+    for i in range(ytms.shape[0]):
+        growth = 1.0 + ytms[i] * 0.5
+        df     = 1.0
+        price  = 0.0
+        for k in range(1, n_periods + 1):
+            df    *= growth
+            price += semi_coupon / df
+        prices[i] = price + face_value / df
+
+    return prices
+
+
+# Warm the JIT cache at import so the first request doesn't pay compile latency
+_price_core(1000.0, 0.07, 0.07, 2)
+_price_core_vec(1000.0, 0.07, np.array([0.07]), 2)
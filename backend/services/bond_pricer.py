@@ -5,12 +5,17 @@ Computes: Price, Modified Duration, Macaulay Duration, Convexity, DV01
 Convention: Semi-annual compounding (standard for Indian G-Secs)
 """
 
+from functools import lru_cache
+
 import numpy as np
 
+from ._core import _price_core, _price_core_vec
+
 
 def price_bond(face_value: float, coupon_rate: float, ytm: float, maturity_years: float) -> dict:
     """
     Price a bond using DCF with semi-annual compounding.
+    Results are memoised on the exact input values.
     
     Args:
         face_value:    Face value in INR (typically 1000)
@@ -21,8 +26,14 @@ def price_bond(face_value: float, coupon_rate: float, ytm: float, maturity_years
     Returns:
         dict with price, duration, convexity, dv01, current_yield
     """
+    # Copy so callers can't mutate the cached entry
+    return dict(_price_bond_cached(face_value, coupon_rate, ytm, maturity_years))
+
+
+@lru_cache(maxsize=4096)
+def _price_bond_cached(face_value: float, coupon_rate: float,
+                       ytm: float, maturity_years: float) -> dict:
     n_periods   = int(maturity_years * 2)   # semi-annual periods
-    semi_coupon = face_value * coupon_rate / 2
     semi_ytm    = ytm / 2
 
     # Edge case: zero-coupon / T-bill
@@ -40,23 +51,17 @@ def price_bond(face_value: float, coupon_rate: float, ytm: float, maturity_years
             "coupon_pct": round(coupon_rate * 100, 4),
         }
 
-    periods = np.arange(1, n_periods + 1)
-    cash_flows = np.full(n_periods, semi_coupon)
-    cash_flows[-1] += face_value  # principal at maturity
-
-    discount_factors = (1 + semi_ytm) ** periods
-    pv_cash_flows    = cash_flows / discount_factors
-    price            = pv_cash_flows.sum()
+    price, mac_sum, conv_sum = _price_core(float(face_value), float(coupon_rate),
+                                           float(ytm), n_periods)
 
     # Macaulay Duration (in years)
-    mac_duration = (pv_cash_flows * periods).sum() / price / 2
+    mac_duration = mac_sum / price / 2
 
     # Modified Duration
     mod_duration = mac_duration / (1 + semi_ytm)
 
     # Convexity
-    convexity_sum = (pv_cash_flows * periods * (periods + 1)).sum()
-    convexity     = convexity_sum / (price * (1 + semi_ytm) ** 2 * 4)
+    convexity = conv_sum / (price * (1 + semi_ytm) ** 2 * 4)
 
     # DV01 (price change per 1 bps shift in yield)
     dv01 = mod_duration * price / 10000
@@ -78,29 +83,50 @@ def price_bond(face_value: float, coupon_rate: float, ytm: float, maturity_years
     }
 
 
+def _price_bond_vec(face_value: float, coupon_rate: float, ytms: np.ndarray,
+                    maturity_years: float) -> np.ndarray:
+    """
+    Price one bond at many yields in a single vectorized pass.
+    Same conventions as price_bond; returns an array of prices aligned with ytms.
+    """
+    ytms      = np.asarray(ytms, dtype=float)
+    n_periods = int(maturity_years * 2)
+
+    # Edge case: zero-coupon / T-bill
+    if n_periods == 0:
+        return face_value / (1 + ytms) ** maturity_years
+
+    # Compiled running product (1+y)^k: one multiply per period, no pow
+    return _price_core_vec(float(face_value), float(coupon_rate), ytms, n_periods)
+
+
 def stress_test_bond(face_value: float, coupon_rate: float, ytm: float,
                      maturity_years: float, quantity: int = 1) -> list:
     """
     Simulate bond P&L under 9 parallel yield curve shocks.
     Shocks in basis points: -300, -200, -100, -50, 0, +50, +100, +200, +300
+    Base and shocked prices are computed together in one vectorized pass.
     """
-    base   = price_bond(face_value, coupon_rate, ytm, maturity_years)
-    shocks = [-300, -200, -100, -50, 0, 50, 100, 200, 300]
-    results = []
+    shocks      = np.array([-300, -200, -100, -50, 0, 50, 100, 200, 300])
+    shocked_ytm = np.maximum(0.0001, ytm + shocks / 10000)
 
-    for shock_bps in shocks:
-        shocked_ytm   = max(0.0001, ytm + shock_bps / 10000)
-        shocked_price = price_bond(face_value, coupon_rate, shocked_ytm, maturity_years)
-        pnl_per_bond  = shocked_price['price'] - base['price']
-        total_pnl     = pnl_per_bond * quantity
+    prices = _price_bond_vec(face_value, coupon_rate,
+                             np.concatenate(([ytm], shocked_ytm)), maturity_years)
+    prices = np.round(prices, 4)
+    base_price, shocked_prices = float(prices[0]), prices[1:]
+
+    results = []
+    for shock_bps, s_ytm, s_price in zip(shocks, shocked_ytm, shocked_prices):
+        pnl_per_bond = float(s_price) - base_price
+        total_pnl    = pnl_per_bond * quantity
 
         results.append({
-            "shock_bps":     shock_bps,
-            "shocked_ytm":   round(shocked_ytm * 100, 4),
-            "price":         shocked_price['price'],
+            "shock_bps":     int(shock_bps),
+            "shocked_ytm":   round(float(s_ytm) * 100, 4),
+            "price":         float(s_price),
             "pnl_per_bond":  round(pnl_per_bond, 4),
             "total_pnl":     round(total_pnl, 2),
-            "pnl_pct":       round(pnl_per_bond / base['price'] * 100, 4),
+            "pnl_pct":       round(pnl_per_bond / base_price * 100, 4),
         })
 
     return results
@@ -7,10 +7,13 @@ Downloads real Indian market data from:
 """
 
 import os
+import orjson
 import requests
 import pandas as pd
 import yfinance as yf
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -23,66 +26,94 @@ print("=" * 60)
 # ─────────────────────────────────────────────────────────────
 # AMFI MUTUAL FUND SCHEMES (real AMFI scheme codes)
 # ─────────────────────────────────────────────────────────────
-FUND_SCHEMES = {
+FUND_SCHEMES = [
     # Large Cap
-    "119598": "SBI Bluechip Fund",
-    "120503": "HDFC Top 100 Fund",
-    "118989": "Axis Bluechip Fund",
+    ("119598", "SBI Bluechip Fund"),
+    ("120503", "HDFC Top 100 Fund"),
+    ("118989", "Axis Bluechip Fund"),
     # Mid Cap
-    "120465": "HDFC Mid-Cap Opportunities",
-    "120503": "Kotak Emerging Equity Fund",
+    ("120465", "HDFC Mid-Cap Opportunities"),
+    ("120503", "Kotak Emerging Equity Fund"),
     # Small Cap
-    "125497": "SBI Small Cap Fund",
-    "120828": "Nippon India Small Cap Fund",
+    ("125497", "SBI Small Cap Fund"),
+    ("120828", "Nippon India Small Cap Fund"),
     # Flexi Cap
-    "112090": "Parag Parikh Flexi Cap Fund",
-    "118778": "UTI Flexi Cap Fund",
+    ("112090", "Parag Parikh Flexi Cap Fund"),
+    ("118778", "UTI Flexi Cap Fund"),
     # Gilt / Long Duration
-    "119027": "SBI Magnum Gilt Fund",
-    "119775": "HDFC Gilt Fund",
+    ("119027", "SBI Magnum Gilt Fund"),
+    ("119775", "HDFC Gilt Fund"),
     # Short Duration
-    "119247": "HDFC Short Term Debt Fund",
+    ("119247", "HDFC Short Term Debt Fund"),
     # Liquid
-    "119568": "SBI Liquid Fund",
-    "120594": "HDFC Liquid Fund",
+    ("119568", "SBI Liquid Fund"),
+    ("120594", "HDFC Liquid Fund"),
     # Hybrid
-    "101206": "HDFC Balanced Advantage Fund",
-    "118701": "ICICI Pru Balanced Advantage",
+    ("101206", "HDFC Balanced Advantage Fund"),
+    ("118701", "ICICI Pru Balanced Advantage"),
     # ELSS
-    "120503": "Axis Long Term Equity Fund",
-    "118769": "Mirae Asset ELSS Fund",
+    ("120503", "Axis Long Term Equity Fund"),
+    ("118769", "Mirae Asset ELSS Fund"),
     # Index
-    "120716": "UTI Nifty 50 Index Fund",
-    "120684": "HDFC Index Fund Nifty 50",
-}
+    ("120716", "UTI Nifty 50 Index Fund"),
+    ("120684", "HDFC Index Fund Nifty 50"),
+]
 
-print(f"\n🔄 [1/3] Downloading {len(FUND_SCHEMES)} mutual fund NAV histories from AMFI...")
-all_navs = []
+# A repeated scheme code would copy one NAV series into several funds and
+# categories. Keep one name per code (the last listed, as the old dict
+# literal did) and flag the others so the codes can be corrected.
+SCHEME_NAMES = dict(FUND_SCHEMES)
+DUPLICATE_SCHEMES = [(code, name) for code, name in FUND_SCHEMES if SCHEME_NAMES[code] != name]
+
+print(f"\n🔄 [1/3] Downloading {len(SCHEME_NAMES)} mutual fund NAV histories from AMFI...")
+for scheme_code, fund_name in DUPLICATE_SCHEMES:
+    print(f"  ⚠️  Skipping {fund_name}: scheme code {scheme_code} already used by {SCHEME_NAMES[scheme_code]}")
+
+# One keep-alive session shared by all workers → single TLS handshake per connection
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
 
-for scheme_code, fund_name in FUND_SCHEMES.items():
+
+def fetch_nav(scheme_code, fund_name):
+    """Download one scheme's NAV history. Returns (DataFrame | None, status line)."""
     try:
         url = f"https://api.mfapi.in/mf/{scheme_code}"
-        resp = requests.get(url, timeout=15)
+        resp = session.get(url, timeout=15)
         if resp.status_code == 200:
-            data = resp.json()
+            data = orjson.loads(resp.content)  # parse bytes directly, no str decode
             navs = data.get('data', [])
-            df = pd.DataFrame(navs)
+            df = pd.DataFrame.from_records(navs, columns=['date', 'nav'])
+            df['nav'] = pd.to_numeric(df['nav'], errors='coerce')
             df['fund_name'] = fund_name
             df['scheme_code'] = scheme_code
-            df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y')
-            df['nav'] = pd.to_numeric(df['nav'], errors='coerce')
             df = df.dropna(subset=['nav'])
-            all_navs.append(df)
-            print(f"  ✅ {fund_name}: {len(df)} NAV records")
-        else:
-            print(f"  ⚠️  {fund_name}: HTTP {resp.status_code}")
+            return df, f"  ✅ {fund_name}: {len(df)} NAV records"
+        return None, f"  ⚠️  {fund_name}: HTTP {resp.status_code}"
     except Exception as e:
-        print(f"  ❌ {fund_name}: {e}")
+        return None, f"  ❌ {fund_name}: {e}"
+
+
+all_navs = []
+with ThreadPoolExecutor(max_workers=8) as ex:
+    for df, status in ex.map(fetch_nav, SCHEME_NAMES.keys(), SCHEME_NAMES.values()):
+        print(status)
+        if df is not None:
+            all_navs.append(df)
 
 if all_navs:
     nav_df = pd.concat(all_navs, ignore_index=True)
-    nav_df.to_csv("data/raw/amfi_nav_history.csv", index=False)
-    print(f"\n  💾 Saved {len(nav_df):,} NAV records → data/raw/amfi_nav_history.csv")
+    # Parse once across all funds: calendar dates repeat per fund, so the
+    # unique-value cache turns ~20× redundant parsing into a lookup
+    nav_df['date'] = pd.to_datetime(nav_df['date'], format='%d-%m-%Y',
+                                    errors='coerce', cache=True)
+    bad_dates = nav_df['date'].isna()
+    if bad_dates.any():
+        for fund_name, n_bad in nav_df.loc[bad_dates, 'fund_name'].value_counts().items():
+            print(f"  ⚠️  {fund_name}: dropped {n_bad} records with malformed dates")
+        nav_df = nav_df[~bad_dates].reset_index(drop=True)
+    nav_df.to_parquet("data/raw/amfi_nav_history.parquet", engine="pyarrow",
+                      compression="zstd", index=False)
+    print(f"\n  💾 Saved {len(nav_df):,} NAV records → data/raw/amfi_nav_history.parquet")
 
 # ─────────────────────────────────────────────────────────────
 # NSE / NIFTY 50 DATA via Yahoo Finance
@@ -101,9 +132,14 @@ nse_frames = []
 end = datetime.today()
 start = end - timedelta(days=365 * 5)
 
+# One batched, threaded request for all tickers → (ticker, field) column MultiIndex
+raw = yf.download(list(TICKERS), start=start, end=end, group_by='ticker',
+                  threads=True, progress=False)
+
 for ticker, name in TICKERS.items():
     try:
-        df = yf.download(ticker, start=start, end=end, progress=False)
+        # Batch index is the union of all tickers' trading days
+        df = raw[ticker].dropna(how='all').copy()
         df['ticker'] = ticker
         df['name'] = name
         df.reset_index(inplace=True)
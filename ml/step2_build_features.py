@@ -16,7 +16,7 @@ print("=" * 60)
 print("⚙️   OptiMarket — Step 2: Building ML Features")
 print("=" * 60)
 
-df = pd.read_csv("data/raw/amfi_nav_history.csv", parse_dates=['date'])
+df = pd.read_parquet("data/raw/amfi_nav_history.parquet", engine="pyarrow")
 df = df.sort_values(['fund_name', 'date']).reset_index(drop=True)
 
 CATEGORY_MAP = {
@@ -45,70 +45,80 @@ CATEGORY_MAP = {
 print(f"\n  Loaded {len(df):,} NAV records across {df['fund_name'].nunique()} funds")
 print("\n🔄 Computing features per fund...")
 
-all_features = []
-
-for fund_name, grp in df.groupby('fund_name'):
-    grp = grp.sort_values('date').copy()
-    grp['return_1d'] = grp['nav'].pct_change()
-
-    # Multi-period returns
-    grp['return_7d']  = grp['nav'].pct_change(7)
-    grp['return_30d'] = grp['nav'].pct_change(30)
-    grp['return_90d'] = grp['nav'].pct_change(90)
-    grp['return_1y']  = grp['nav'].pct_change(252)
-
-    # Volatility
-    grp['volatility_30d'] = grp['return_1d'].rolling(30).std() * np.sqrt(252)
-    grp['volatility_90d'] = grp['return_1d'].rolling(90).std() * np.sqrt(252)
-
-    # Sharpe (using 6.5% RBI repo rate as risk-free)
-    rf_daily = 0.065 / 252
-    grp['sharpe_30d'] = (grp['return_1d'].rolling(30).mean() - rf_daily) / \
-                         grp['return_1d'].rolling(30).std()
-    grp['sharpe_1y']  = (grp['return_1d'].rolling(252).mean() - rf_daily) / \
-                         grp['return_1d'].rolling(252).std()
-
-    # Sortino
-    downside = grp['return_1d'].apply(lambda x: min(x, 0))
-    grp['sortino_30d'] = (grp['return_1d'].rolling(30).mean() - rf_daily) / \
-                          downside.rolling(30).std()
-
-    # Momentum score (composite)
-    grp['momentum_score'] = (
-        grp['return_7d'].rank(pct=True) * 0.2 +
-        grp['return_30d'].rank(pct=True) * 0.3 +
-        grp['return_90d'].rank(pct=True) * 0.5
-    )
-
-    # Max drawdown
-    rolling_max = grp['nav'].rolling(252, min_periods=1).max()
-    grp['max_drawdown_1y'] = (grp['nav'] - rolling_max) / rolling_max
-
-    # Technical indicators
-    grp['ma20'] = grp['nav'].rolling(20).mean()
-    grp['ma50'] = grp['nav'].rolling(50).mean()
-    grp['above_ma20']   = (grp['nav'] > grp['ma20']).astype(int)
-    grp['above_ma50']   = (grp['nav'] > grp['ma50']).astype(int)
-    grp['ma_crossover'] = (grp['ma20'] > grp['ma50']).astype(int)
-
-    # Category encoding
-    cat_name, cat_code = CATEGORY_MAP.get(fund_name, ("Unknown", 99))
-    grp['category']      = cat_name
-    grp['category_code'] = cat_code
-
-    all_features.append(grp)
+# df is sorted by (fund_name, date), so every grouped op below runs as one
+# Cython pass over the whole frame and lines up with df's index.
+by_fund  = df.groupby('fund_name', sort=False)
+rf_daily = 0.065 / 252  # 6.5% RBI repo rate as risk-free
+
+
+def rolling(series, window, stat, **kwargs):
+    """Per-fund rolling `stat` of `series`, aligned back to df's index."""
+    r = series.groupby(df['fund_name'], sort=False).rolling(window, **kwargs)
+    return getattr(r, stat)().reset_index(level=0, drop=True)
+
+
+df['return_1d'] = by_fund['nav'].pct_change()
+
+# Multi-period returns
+df['return_7d']  = by_fund['nav'].pct_change(7)
+df['return_30d'] = by_fund['nav'].pct_change(30)
+df['return_90d'] = by_fund['nav'].pct_change(90)
+df['return_1y']  = by_fund['nav'].pct_change(252)
+
+# Volatility
+std_30d  = rolling(df['return_1d'], 30, 'std')
+std_252d = rolling(df['return_1d'], 252, 'std')
+df['volatility_30d'] = std_30d * np.sqrt(252)
+df['volatility_90d'] = rolling(df['return_1d'], 90, 'std') * np.sqrt(252)
+
+# Sharpe
+mean_30d = rolling(df['return_1d'], 30, 'mean')
+df['sharpe_30d'] = (mean_30d - rf_daily) / std_30d
+df['sharpe_1y']  = (rolling(df['return_1d'], 252, 'mean') - rf_daily) / std_252d
+
+# Sortino
+downside = df['return_1d'].clip(upper=0.0)
+df['sortino_30d'] = (mean_30d - rf_daily) / rolling(downside, 30, 'std')
+
+# Momentum score (composite)
+df['momentum_score'] = (
+    by_fund['return_7d'].rank(pct=True) * 0.2 +
+    by_fund['return_30d'].rank(pct=True) * 0.3 +
+    by_fund['return_90d'].rank(pct=True) * 0.5
+)
+
+# Max drawdown
+rolling_max = rolling(df['nav'], 252, 'max', min_periods=1)
+df['max_drawdown_1y'] = (df['nav'] - rolling_max) / rolling_max
+
+# Technical indicators
+df['ma20'] = rolling(df['nav'], 20, 'mean')
+df['ma50'] = rolling(df['nav'], 50, 'mean')
+df['above_ma20']   = (df['nav'] > df['ma20']).astype(int)
+df['above_ma50']   = (df['nav'] > df['ma50']).astype(int)
+df['ma_crossover'] = (df['ma20'] > df['ma50']).astype(int)
+
+# Category encoding
+fund_categories = {f: CATEGORY_MAP.get(f, ("Unknown", 99)) for f in df['fund_name'].unique()}
+df['category']      = df['fund_name'].map({f: c[0] for f, c in fund_categories.items()})
+df['category_code'] = df['fund_name'].map({f: c[1] for f, c in fund_categories.items()})
 
 print("  ✅ Features computed for all funds")
 
-features_df = pd.concat(all_features, ignore_index=True)
-features_df = features_df.dropna(subset=['return_30d', 'volatility_30d', 'sharpe_30d'])
+features_df = df.dropna(subset=['return_30d', 'volatility_30d', 'sharpe_30d'])
+# Features were written into df in place (no per-fund frames to concat); release
+# it and the helper series so only the filtered frame stays resident
+del df, by_fund, std_30d, std_252d, mean_30d, downside, rolling_max
 
 # ─── Generate recommendation labels ───────────────────────────
 print("\n🔄 Generating BUY/SELL/HOLD labels...")
 
-buy_threshold  = features_df.groupby('category')['sharpe_30d'].transform(lambda x: x.quantile(0.70))
-sell_threshold = features_df.groupby('category')['sharpe_30d'].transform(lambda x: x.quantile(0.30))
-cat_median_ret = features_df.groupby('category')['return_30d'].transform('median')
+# One grouped quantile per category, broadcast back to rows with map
+by_category    = features_df.groupby('category')
+sharpe_q       = by_category['sharpe_30d'].quantile([0.30, 0.70]).unstack()
+buy_threshold  = features_df['category'].map(sharpe_q[0.70])
+sell_threshold = features_df['category'].map(sharpe_q[0.30])
+cat_median_ret = features_df['category'].map(by_category['return_30d'].median())
 
 features_df['recommendation'] = 'HOLD'
 buy_mask  = (features_df['sharpe_30d'] >= buy_threshold) & (features_df['return_30d'] >= cat_median_ret)
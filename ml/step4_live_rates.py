@@ -8,11 +8,15 @@ Fetches live Indian market rates from:
 
 import pandas as pd
 import numpy as np
+import orjson
 import requests
 import yfinance as yf
+import io
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -24,11 +28,28 @@ print("=" * 60)
 
 market = {}
 
+# ─── Start all HTTP downloads concurrently on one keep-alive session ──
+FRED_CSV_URL = "https://fred.stlouisfed.org/graph/fredgraph.csv?id={}"
+
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+
+def fetch(url):
+    resp = session.get(url, timeout=15)
+    resp.raise_for_status()
+    return resp
+
+
+pool = ThreadPoolExecutor(max_workers=4)
+rbi_future    = pool.submit(fetch, FRED_CSV_URL.format("IRSTCI01INM156N"))
+gsec_future   = pool.submit(fetch, FRED_CSV_URL.format("IRLTLT01INM156N"))
+liquid_future = pool.submit(fetch, "https://api.mfapi.in/mf/119568")  # SBI Liquid Fund
+
 # ─── RBI Repo Rate from FRED ──────────────────────────────────
 print("\n🔄 [1/4] Fetching RBI Repo Rate from FRED (IMF series)...")
 try:
-    url = "https://fred.stlouisfed.org/graph/fredgraph.csv?id=IRSTCI01INM156N"
-    df_rbi = pd.read_csv(url, parse_dates=['DATE'])
+    df_rbi = pd.read_csv(io.StringIO(rbi_future.result().text), parse_dates=['DATE'])
     df_rbi = df_rbi.dropna()
     latest_rbi = float(df_rbi.iloc[-1]['IRSTCI01INM156N'])
     market['rbi_repo_rate'] = round(latest_rbi, 2)
@@ -41,8 +62,7 @@ except Exception as e:
 # ─── 10Y G-Sec Yield from FRED ───────────────────────────────
 print("\n🔄 [2/4] Fetching 10Y G-Sec Yield from FRED (IMF series)...")
 try:
-    url = "https://fred.stlouisfed.org/graph/fredgraph.csv?id=IRLTLT01INM156N"
-    df_gsec = pd.read_csv(url, parse_dates=['DATE'])
+    df_gsec = pd.read_csv(io.StringIO(gsec_future.result().text), parse_dates=['DATE'])
     df_gsec = df_gsec.dropna()
     latest_gsec = float(df_gsec.iloc[-1]['IRLTLT01INM156N'])
     market['gsec_10y_yield'] = round(latest_gsec, 2)
@@ -70,10 +90,9 @@ except Exception as e:
 # ─── T-Bill Proxy from AMFI Liquid Fund ──────────────────────
 print("\n🔄 [4/4] Computing T-Bill proxy from AMFI Liquid Fund NAVs...")
 try:
-    url  = "https://api.mfapi.in/mf/119568"  # SBI Liquid Fund
-    resp = requests.get(url, timeout=15)
-    data = resp.json()['data']
-    nav_df = pd.DataFrame(data)
+    resp = liquid_future.result()
+    data = orjson.loads(resp.content)['data']
+    nav_df = pd.DataFrame.from_records(data, columns=['date', 'nav'])
     nav_df['date'] = pd.to_datetime(nav_df['date'], format='%d-%m-%Y')
     nav_df['nav']  = pd.to_numeric(nav_df['nav'])
     nav_df = nav_df.sort_values('date').tail(95)
@@ -84,6 +103,8 @@ except Exception as e:
     market['tbill_proxy_rate'] = 6.85
     print(f"  ⚠️  Using fallback: 6.85% ({e})")
 
+pool.shutdown()
+
 market['last_updated'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 with open("data/processed/market_summary.json", "w") as f: